@@ -10,7 +10,7 @@ if TYPE_CHECKING:
 
     from .validation import ConfigItems
 
-__all__ = ["Configuration", "SchemaAwareMixin", "coerce_to_bool", "BOOL_TRUE_STRINGS", "BOOL_FALSE_STRINGS", "BOOL_STRINGS"]
+__all__ = ["Configuration", "SchemaAwareMixin", "coerce_to_bool", "section_hash", "BOOL_TRUE_STRINGS", "BOOL_FALSE_STRINGS", "BOOL_STRINGS"]
 
 # Type alias for config values
 ConfigValueType = float | bool | str | list | dict
@@ -47,6 +47,18 @@ def coerce_to_bool(value: ConfigValueType | None, default: bool = False) -> bool
     return bool(value)
 
 
+def section_hash(section: dict[str, Any]) -> int:
+    """Return a hash of the content of a configuration section.
+
+    On reload the configuration is updated in place, so the objects are kept:
+    comparing this value is the way to detect a changed section.
+
+    Args:
+        section: The configuration section
+    """
+    return hash(repr(sorted(section.items())))
+
+
 class SchemaAwareMixin:
     """Mixin providing schema-aware defaults and typed config value accessors.
 
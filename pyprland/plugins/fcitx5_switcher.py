@@ -3,11 +3,75 @@
 # from ..validation import ConfigField, ConfigItems
 # from .interface import Plugin
 import re
-import contextlib
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, cast
 
+from pyprland.config import section_hash
 from pyprland.plugins.interface import Plugin
 from pyprland.validation import ConfigField, ConfigItems
 
+if TYPE_CHECKING:
+    from pyprland.models import ClientInfo
+
+FCITX_ENABLE_CMD = "execr fcitx5-remote -o"
+FCITX_DISABLE_CMD = "execr fcitx5-remote -c"
+DEDUPE_DELAY = 0.05  # Repeated focus events for the same window within this delay (in seconds) are ignored
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+# group references can't survive being merged into a single alternation
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+@lru_cache(maxsize=256)
+def _compile_or_none(pattern: str) -> re.Pattern[str] | None:
+    """Compile `pattern`, returns None if it isn't a valid regex."""
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+def compile_patterns(patterns: list[Any]) -> tuple[list[re.Pattern[str]], frozenset[str]]:
+    """Compile the configured patterns, keeping invalid regexes as literals.
+
+    Valid patterns are fused into a single alternation so matching a value
+    is one `search` call. If they can't be fused (eg: group references or
+    global inline flags), the individually compiled patterns are kept.
+
+    Patterns without any regex metacharacter are usually complete window
+    classes: they are also added to the literals, to be found by a simple
+    set lookup before running the regexes.
+
+    Args:
+        patterns: The raw patterns from the configuration
+
+    Returns:
+        The compiled patterns and the literals (matched by equality)
+    """
+    compiled: list[re.Pattern[str]] = []
+    literals: set[str] = set()
+    for p in patterns:
+        text = str(p)
+        regex = _compile_or_none(text)
+        if regex is None:
+            literals.add(text)
+        else:
+            compiled.append(regex)
+            if _REGEX_METACHARS.isdisjoint(text):
+                literals.add(text)
+    if len(compiled) > 1 and not any(_GROUP_REFERENCE.search(r.pattern) for r in compiled):
+        fused = _compile_or_none("|".join(f"(?:{r.pattern})" for r in compiled))
+        if fused is not None:
+            compiled = [fused]
+    return compiled, frozenset(literals)
+
+
+def matches_any(value: str, patterns: list[re.Pattern[str]], literals: frozenset[str]) -> bool:
+    """Check if `value` equals one of the `literals` or matches any of the compiled `patterns`."""
+    return value in literals or any(r.search(value) for r in patterns)
+
 
 class Extension(Plugin):
     """A plugin to auto-switch Fcitx5 input method status by window class/title."""
@@ -16,14 +80,37 @@ class Extension(Plugin):
         super().__init__(name)
         # support loading as `external:fcitx5_switcher` while reading [fcitx5_switcher]
         self._conf_name = name.split(":", 1)[1] if ":" in name else name
+        self._config_hash: int | None = None
+        self._last_addr: str | None = None
+        self._last_ts = 0.0
+        # patterns are compiled once per (re)load, invalid regexes fall back to equality
+        self._active_class_re: list[re.Pattern[str]] = []
+        self._active_title_re: list[re.Pattern[str]] = []
+        self._inactive_class_re: list[re.Pattern[str]] = []
+        self._inactive_title_re: list[re.Pattern[str]] = []
+        self._active_class_literals: frozenset[str] = frozenset()
+        self._active_title_literals: frozenset[str] = frozenset()
+        self._inactive_class_literals: frozenset[str] = frozenset()
+        self._inactive_title_literals: frozenset[str] = frozenset()
 
     async def load_config(self, config: dict[str, Any]) -> None:  # type: ignore[override]
-        """Load configuration using base section name (e.g. `fcitx5_switcher`)."""
+        """Load configuration using base section name (e.g. `fcitx5_switcher`).
+
+        Nothing is done if the section didn't change since the last call.
+        """
+        section = config.get(self._conf_name, {})
+        config_hash = section_hash(section)
+        if config_hash == self._config_hash:
+            return
+        self._config_hash = config_hash
         self.config.clear()
-        with contextlib.suppress(KeyError):
-            self.config.update(config[self._conf_name])
+        self.config.update(section)
         if self.config_schema:
             self.config.set_schema(self.config_schema)
+        self._active_class_re, self._active_class_literals = compile_patterns(self.get_config_list("active_classes"))
+        self._active_title_re, self._active_title_literals = compile_patterns(self.get_config_list("active_titles"))
+        self._inactive_class_re, self._inactive_class_literals = compile_patterns(self.get_config_list("inactive_classes"))
+        self._inactive_title_re, self._inactive_title_literals = compile_patterns(self.get_config_list("inactive_titles"))
 
     environments = ["hyprland"]
 
@@ -42,40 +129,36 @@ class Extension(Plugin):
         """
         _addr = "0x" + _addr
 
-        active_classes = self.get_config_list("active_classes")
-        active_titles = self.get_config_list("active_titles")
-        inactive_classes = self.get_config_list("inactive_classes")
-        inactive_titles = self.get_config_list("inactive_titles")
-
-        clients = await self.get_clients()
-
-        for client in clients:
-            if client["address"] == _addr:
-                # Hyprland client dict uses 'class_' key
-                cls = client.get("class") or ""
-                title = client.get("title") or ""
-                self.log.debug("fcitx5_switcher: active client class=%s title=%s", cls, title)
-
-                # Use regex matching for titles and classes (config may contain patterns)
-                def matches_any(value: str, patterns: list[str]) -> bool:
-                    for p in patterns:
-                        try:
-                            if re.search(str(p), value):
-                                return True
-                        except re.error:
-                            # fallback to simple equality if invalid regex
-                            if value == str(p):
-                                return True
-                    return False
-
-                should_enable = matches_any(cls, active_classes) or matches_any(title, active_titles)
-                should_disable = matches_any(cls, inactive_classes) or matches_any(title, inactive_titles)
-
-                if should_enable:
-                    self.log.debug("fcitx5_switcher: enabling fcitx for class=%s title=%s", cls, title)
-                    ok = await self.backend.execute("execr fcitx5-remote -o")
-                    self.log.debug("fcitx5_switcher: execute returned %s", ok)
-                if should_disable:
-                    self.log.debug("fcitx5_switcher: disabling fcitx for class=%s title=%s", cls, title)
-                    ok = await self.backend.execute("execr fcitx5-remote -c")
-                    self.log.debug("fcitx5_switcher: execute returned %s", ok)
+        now = time.monotonic()
+        if _addr == self._last_addr and now - self._last_ts < DEDUPE_DELAY:
+            return
+        self._last_addr = _addr
+        self._last_ts = now
+
+        client = cast("ClientInfo", await self.backend.execute_json("activewindow"))
+        if client.get("address") != _addr:
+            # focus changed again since the event was emitted, look for the window in the full list
+            event_client = next((c for c in await self.get_clients() if c["address"] == _addr), None)
+            if event_client is None:
+                return
+            client = event_client
+
+        # Hyprland client dict uses 'class_' key
+        cls = cast("str", client.get("class") or "")
+        title = client.get("title") or ""
+        self.log.debug("fcitx5_switcher: active client class=%s title=%s", cls, title)
+
+        # Use regex matching for titles and classes (config may contain patterns)
+        # activation wins over deactivation, titles are only checked if the class didn't match
+        if matches_any(cls, self._active_class_re, self._active_class_literals) or matches_any(
+            title, self._active_title_re, self._active_title_literals
+        ):
+            self.log.debug("fcitx5_switcher: enabling fcitx for class=%s title=%s", cls, title)
+            ok = await self.backend.execute(FCITX_ENABLE_CMD)
+            self.log.debug("fcitx5_switcher: execute returned %s", ok)
+        elif matches_any(cls, self._inactive_class_re, self._inactive_class_literals) or matches_any(
+            title, self._inactive_title_re, self._inactive_title_literals
+        ):
+            self.log.debug("fcitx5_switcher: disabling fcitx for class=%s title=%s", cls, title)
+            ok = await self.backend.execute(FCITX_DISABLE_CMD)
+            self.log.debug("fcitx5_switcher: execute returned %s", ok)
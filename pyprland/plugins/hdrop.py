@@ -1,14 +1,28 @@
 """Hdrop - Quick window dropdown/scratchpad functionality."""
 
 import asyncio
-import contextlib
+import sys
 from dataclasses import dataclass
 from typing import Any, cast
 
+from pyprland.config import section_hash
+from pyprland.models import ClientInfo
 from pyprland.plugins.interface import Plugin
 
+HDROP_WORKSPACE = sys.intern("special:hdrop")  # Special workspace holding the hidden windows
 
-@dataclass
+
+def _class_windows(clients: list[ClientInfo], class_name: str) -> list[tuple[ClientInfo, str]]:
+    """Return the clients with the given class, along with their workspace name."""
+    return [(client, client["workspace"]["name"]) for client in clients if cast("str", client["class"]) == class_name]
+
+
+def _hidden_client(windows: list[tuple[ClientInfo, str]]) -> ClientInfo | None:
+    """Return the first of the `windows` in the hdrop workspace, if any."""
+    return next((c for c, ws_name in windows if ws_name == HDROP_WORKSPACE), None)
+
+
+@dataclass(slots=True, frozen=True)
 class HdropOptions:
     """Options for handling hdrop window actions."""
 
@@ -18,7 +32,6 @@ class HdropOptions:
     height: int | None
     width: int | None
     center: bool
-    skip: bool = False
     launch_on_missing: bool = False
 
 
@@ -31,22 +44,34 @@ class Extension(Plugin):
         # Normalize config section name so external:hdrop still reads [hdrop]
         self._conf_name = name.split(":", 1)[1] if ":" in name else name
         self.apps: dict[str, dict[str, Any]] = {}
+        self._app_names: frozenset[str] = frozenset()
+        self._config_hash: int | None = None
+        self._config_changed = True
 
     async def load_config(self, config: dict[str, Any]) -> None:
         """Load the plugin configuration using the base section name.
 
         This allows the plugin to be loaded as `external:hdrop` while still
         reading configuration from `[hdrop]` in the user's config file.
+        Nothing is done if the section didn't change since the last call.
         """
+        section = config.get(self._conf_name, {})
+        config_hash = section_hash(section)
+        self._config_changed = config_hash != self._config_hash
+        if not self._config_changed:
+            return
+        self._config_hash = config_hash
         self.config.clear()
-        with contextlib.suppress(KeyError):
-            self.config.update(config[self._conf_name])
+        self.config.update(section)
         if self.config_schema:
             self.config.set_schema(self.config_schema)
 
     async def on_reload(self) -> None:
         """Load apps configuration from config file."""
+        if not self._config_changed:
+            return
         self.apps = cast("dict[str, dict[str, Any]]", self.config.get("apps", {}))
+        self._app_names = frozenset(name for name, app_conf in self.apps.items() if app_conf)
         self.log.debug("Loaded %d hdrop apps from config", len(self.apps))
 
     def _get_app_config(self, app_name: str) -> dict[str, Any]:
@@ -77,9 +102,9 @@ class Extension(Plugin):
 
         Behaviour is driven entirely from `hdrop.apps.<app_name>` config.
         """
-        app_conf = self._get_app_config(app_name)
-        if not app_conf:
+        if app_name not in self._app_names:
             return f"Error: app '{app_name}' not configured"
+        app_conf = self._get_app_config(app_name)
 
         # Determine class identifier (used to find/manage windows)
         class_name = cast("str", app_conf.get("class", app_name))
@@ -142,8 +167,9 @@ class Extension(Plugin):
         if not class_name:
             return "Error: CLASS name required"
 
-        if await self._is_window_in_hdrop(class_name):
-            await self._move_window_to_active_workspace(class_name)
+        hidden_client = _hidden_client(_class_windows(await self.get_clients(), class_name))
+        if hidden_client is not None:
+            await self._move_window_to_active_workspace(class_name, hidden_client["address"])
         else:
             await self.backend.execute(f"focuswindow class:{class_name}")
         return None
@@ -183,7 +209,7 @@ class Extension(Plugin):
         if not class_name:
             return "Error: CLASS name required"
 
-        if await self._is_window_exists(class_name):
+        if _class_windows(await self.get_clients(), class_name):
             await self._move_window_to_hdrop(class_name)
         return None
 
@@ -192,25 +218,37 @@ class Extension(Plugin):
 
     # Helper methods
 
-    async def _is_window_exists(self, class_name: str) -> bool:
-        """Check if a window with the given class exists."""
-        clients = await self.get_clients()
-        return any(cast("str", c["class"]) == class_name for c in clients)
+    async def _wait_for_window(self, class_name: str, max_wait: float = 2.0, interval: float = 0.05) -> list[tuple[ClientInfo, str]] | None:
+        """Wait for a window with the given class to show up.
+
+        Args:
+            class_name: The window class to wait for
+            max_wait: Maximum waiting time, in seconds
+            interval: Delay between two checks, in seconds
 
-    async def _is_window_in_hdrop(self, class_name: str) -> bool:
-        """Check if a window is in the hdrop workspace."""
-        clients = await self.get_clients()
-        return any(cast("str", c["class"]) == class_name and cast("str", c["workspace"]["name"]) == "special:hdrop" for c in clients)
+        Returns:
+            The windows with the given class once one appeared, None if none showed up in time
+        """
+        for _ in range(round(max_wait / interval)):
+            await asyncio.sleep(interval)
+            windows = _class_windows(await self.get_clients(), class_name)
+            if windows:
+                return windows
+        return None
 
     async def _move_window_to_hdrop(self, class_name: str) -> None:
         """Move a window to the hdrop scratchpad."""
-        await self.backend.execute(f"movetoworkspacesilent special:hdrop,class:{class_name}")
+        await self.backend.execute(f"movetoworkspacesilent {HDROP_WORKSPACE},class:{class_name}")
+
+    async def _move_window_to_active_workspace(self, class_name: str, address: str | None = None) -> None:
+        """Move a window to the active workspace.
 
-    async def _move_window_to_active_workspace(self, class_name: str) -> None:
-        """Move a window to the active workspace."""
+        The window is selected by `address` when provided, else by `class_name`.
+        """
         workspace = cast("dict[str, Any]", await self.backend.execute_json("activeworkspace"))
         workspace_id = cast("int", workspace["id"])
-        await self.backend.execute(f"movetoworkspace {workspace_id},class:{class_name}")
+        selector = f"address:{address}" if address else f"class:{class_name}"
+        await self.backend.execute(f"movetoworkspace {workspace_id},{selector}")
 
     async def _handle_window(self, class_name: str, opts: HdropOptions) -> None:
         """Handle window display/hide logic.
@@ -218,40 +256,29 @@ class Extension(Plugin):
         Parameters are grouped in `HdropOptions` to reduce function arity.
         """
         command = opts.command
-        focus_flag = opts.focus
-        floating_flag = opts.floating
-        height = opts.height
-        width = opts.width
-        center_flag = opts.center
-        skip_flag = opts.skip
-        launch_on_missing = opts.launch_on_missing
+
+        windows = _class_windows(await self.get_clients(), class_name)
 
         # Launch command if needed and window doesn't exist and allowed by config
-        if not skip_flag and command is not None and not await self._is_window_exists(class_name) and launch_on_missing:
+        if command is not None and not windows and opts.launch_on_missing:
             await self.backend.execute(f"exec {command}")
-            await asyncio.sleep(0.5)
-            # Recursively call with skip=True
-            new_opts = HdropOptions(
-                command=command,
-                focus=focus_flag,
-                floating=floating_flag,
-                height=height,
-                width=width,
-                center=center_flag,
-                skip=True,
-                launch_on_missing=opts.launch_on_missing,
-            )
-            await self._handle_window(class_name, new_opts)
-            return
+            launched_windows = await self._wait_for_window(class_name)
+            if launched_windows is None:
+                self.log.warning("No window with class %s detected after running %s", class_name, command)
+                return
+            windows = launched_windows
 
         # Window exists: act according to flags
-        if await self._is_window_exists(class_name):
-            if await self._is_window_in_hdrop(class_name):
+        if windows:
+            hidden_client = _hidden_client(windows)
+            if hidden_client is not None:
                 # Window is in hdrop, bring it to active workspace
-                await self._move_window_to_active_workspace(class_name)
-                if floating_flag:
-                    await self._configure_floating_window(class_name, height, width, center_flag)
-            elif focus_flag:
+                await self._move_window_to_active_workspace(class_name, hidden_client["address"])
+                if opts.floating:
+                    # the client list predates the move: include the window we just brought back
+                    targets = [c for c, ws_name in windows if c is hidden_client or ws_name != HDROP_WORKSPACE]
+                    await self._configure_floating_window(class_name, opts.height, opts.width, opts.center, targets)
+            elif opts.focus:
                 # Just focus the window
                 await self.backend.execute(f"focuswindow class:{class_name}")
             else:
@@ -264,25 +291,23 @@ class Extension(Plugin):
         height: int | None,
         width: int | None,
         center_flag: bool,
+        target_clients: list[ClientInfo],
     ) -> None:
-        """Configure a floating window."""
+        """Configure a floating window.
+
+        `target_clients` are the windows to make floating.
+        """
         # Ensure floating mode for the window(s)
-        clients = await self.get_clients()
-        target_clients = [
-            c for c in clients if cast("str", c["class"]) == class_name and cast("str", c["workspace"]["name"]) != "special:hdrop"
-        ]
-
-        if target_clients:
-            for client in target_clients:
-                if not cast("bool", client["floating"]):
-                    await self.backend.execute(f"togglefloating address:{client['address']}")
-        else:
-            await self.backend.execute(f"togglefloating class:{class_name}")
+        commands = [f"togglefloating address:{client['address']}" for client in target_clients if not cast("bool", client["floating"])]
 
         # Resize if dimensions provided
         if height is not None and width is not None:
-            await self.backend.execute(f"resizewindowpixel exact {width} {height},class:{class_name}")
+            commands.append(f"resizewindowpixel exact {width} {height},class:{class_name}")
 
         # Center the window if requested
         if center_flag:
-            await self.backend.execute(f"centerwindow class:{class_name}")
+            commands.append(f"centerwindow class:{class_name}")
+
+        # Send everything in a single batch request
+        if commands:
+            await self.backend.execute(commands)
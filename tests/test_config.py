@@ -1,4 +1,4 @@
-from pyprland.config import Configuration
+from pyprland.config import Configuration, section_hash
 from pyprland.validation import ConfigField, ConfigValidator, _find_similar_key, format_config_error
 
 
@@ -9,6 +9,15 @@ def test_config_access(test_logger):
     assert conf.get("c", 3) == 3
 
 
+def test_section_hash():
+    section = {"b": [1, 2], "a": {"x": 1}}
+    assert section_hash(section) == section_hash({"a": {"x": 1}, "b": [1, 2]})
+
+    old_hash = section_hash(section)
+    section["b"].append(3)
+    assert section_hash(section) != old_hash
+
+
 def test_get_bool(test_logger):
     conf = Configuration(
         {
@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from pyprland.plugins.fcitx5_switcher import Extension, compile_patterns, matches_any
+from pyprland.utils import merge
+from tests.conftest import make_extension
+
+CONFIG = {
+    "fcitx5_switcher": {
+        "active_classes": ["wechat", "^QQ$"],
+        "active_titles": ["Chat"],
+        "inactive_classes": ["kitty", "[invalid"],
+        "inactive_titles": [],
+    }
+}
+
+
+@pytest_asyncio.fixture
+async def extension():
+    ext = make_extension(Extension)
+    await ext.load_config(CONFIG)
+    return ext
+
+
+def test_compile_patterns():
+    compiled, literals = compile_patterns(["foo", "^bar$", "[invalid"])
+    assert [p.pattern for p in compiled] == ["(?:foo)|(?:^bar$)"]
+    assert literals == {"foo", "[invalid"}
+
+    assert matches_any("foobar", compiled, literals)
+    assert matches_any("bar", compiled, literals)
+    assert matches_any("[invalid", compiled, literals)
+    assert not matches_any("barbar", compiled, literals)
+
+
+def test_compile_patterns_unfusable():
+    # group references and global flags are kept as separate patterns
+    compiled, _ = compile_patterns([r"(a)\1", "b"])
+    assert [p.pattern for p in compiled] == [r"(a)\1", "b"]
+    assert matches_any("aa", compiled, frozenset())
+    assert not matches_any("ac", compiled, frozenset())
+
+    compiled, _ = compile_patterns(["(?i)foo", "(?i)bar"])
+    assert len(compiled) == 2
+    assert matches_any("BAR", compiled, frozenset())
+
+
+@pytest.mark.asyncio
+async def test_enable_by_class(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "wechat", "title": "WeChat"}
+
+    await extension.event_activewindowv2("2")
+
+    extension.get_clients.assert_not_called()
+    extension.backend.execute.assert_called_once_with("execr fcitx5-remote -o")
+
+
+@pytest.mark.asyncio
+async def test_focus_changed(extension):
+    # the active window isn't the one from the event anymore
+    extension.backend.execute_json.return_value = {"address": "0x1", "class": "kitty", "title": "shell"}
+    extension.get_clients.return_value = [
+        {"address": "0x1", "class": "kitty", "title": "shell"},
+        {"address": "0x2", "class": "wechat", "title": "WeChat"},
+    ]
+
+    await extension.event_activewindowv2("2")
+    extension.backend.execute.assert_called_once_with("execr fcitx5-remote -o")
+
+    extension.backend.execute.reset_mock()
+    await extension.event_activewindowv2("3")
+    extension.backend.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enable_by_title(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "firefox", "title": "Chat room"}
+
+    await extension.event_activewindowv2("2")
+
+    extension.backend.execute.assert_called_once_with("execr fcitx5-remote -o")
+
+
+@pytest.mark.asyncio
+async def test_disable_invalid_regex_literal(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "[invalid", "title": ""}
+
+    await extension.event_activewindowv2("2")
+
+    extension.backend.execute.assert_called_once_with("execr fcitx5-remote -c")
+
+
+@pytest.mark.asyncio
+async def test_no_match(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "QQmusic", "title": "player"}
+
+    await extension.event_activewindowv2("2")
+
+    extension.backend.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reload_unchanged(extension):
+    config = {"fcitx5_switcher": {"active_classes": ["wechat"]}}
+    await extension.load_config(config)
+    compiled = extension._active_class_re
+
+    # the manager merges the new configuration in place on reload
+    merge(config, {"fcitx5_switcher": {"active_classes": ["wechat"]}}, replace=True)
+    await extension.load_config(config)
+    assert extension._active_class_re is compiled
+
+    merge(config, {"fcitx5_switcher": {"active_classes": ["zoom"]}}, replace=True)
+    await extension.load_config(config)
+    assert extension._active_class_re is not compiled
+    assert matches_any("zoom", extension._active_class_re, extension._active_class_literals)
+    assert extension._inactive_class_re == []
+
+
+@pytest.mark.asyncio
+async def test_enable_wins(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "kitty", "title": "Chat"}
+
+    await extension.event_activewindowv2("2")
+
+    extension.backend.execute.assert_called_once_with("execr fcitx5-remote -o")
+
+
+@pytest.mark.asyncio
+async def test_repeated_events(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "wechat", "title": "WeChat"}
+
+    with patch("time.monotonic", side_effect=[10.0, 10.01, 10.02, 11.0]):
+        await extension.event_activewindowv2("2")
+        await extension.event_activewindowv2("2")  # ignored
+        await extension.event_activewindowv2("3")
+        await extension.event_activewindowv2("3")
+
+    assert extension.backend.execute_json.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_no_config_lookup_on_event(extension):
+    extension.backend.execute_json.return_value = {"address": "0x2", "class": "kitty", "title": "shell"}
+
+    with patch.object(extension, "get_config_list") as get_config_list:
+        await extension.event_activewindowv2("2")
+
+    get_config_list.assert_not_called()
+    extension.backend.execute.assert_called_once_with("execr fcitx5-remote -c")
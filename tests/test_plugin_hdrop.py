@@ -0,0 +1,165 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+from pyprland.plugins.hdrop import Extension
+from pyprland.utils import merge
+from tests.conftest import make_extension
+
+APPS = {
+    "kitty": {"class": "kitty-drop", "command": "kitty --class kitty-drop", "launch_on_missing": True},
+    "term": {"class": "term", "floating": True, "width": 800, "height": 600, "center": True},
+}
+
+
+def client(address, class_name, workspace="1", floating=False):
+    return {"address": address, "class": class_name, "workspace": {"name": workspace}, "floating": floating}
+
+
+@pytest_asyncio.fixture
+async def extension():
+    ext = make_extension(Extension)
+    await ext.load_config({"hdrop": {"apps": APPS}})
+    await ext.on_reload()
+    ext.backend.execute_json.return_value = {"id": 3}
+    return ext
+
+
+@pytest.mark.asyncio
+async def test_unknown_app(extension):
+    assert await extension.run_hdrop("nope") == "Error: app 'nope' not configured"
+    extension.get_clients.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_hide_visible_window(extension):
+    extension.get_clients.return_value = [client("0x1", "kitty-drop")]
+
+    await extension.run_hdrop("kitty")
+
+    extension.get_clients.assert_called_once()
+    extension.backend.execute.assert_called_once_with("movetoworkspacesilent special:hdrop,class:kitty-drop")
+
+
+@pytest.mark.asyncio
+async def test_show_hidden_floating_window(extension):
+    extension.get_clients.return_value = [client("0x1", "term", "special:hdrop"), client("0x2", "other")]
+
+    await extension.run_hdrop("term")
+
+    extension.get_clients.assert_called_once()
+    assert [c.args[0] for c in extension.backend.execute.call_args_list] == [
+        "movetoworkspace 3,address:0x1",
+        [
+            "togglefloating address:0x1",
+            "resizewindowpixel exact 800 600,class:term",
+            "centerwindow class:term",
+        ],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_show_hidden_already_floating(extension):
+    extension.get_clients.return_value = [client("0x1", "term", "special:hdrop", floating=True), client("0x2", "term")]
+
+    await extension.run_hdrop("term")
+
+    assert [c.args[0] for c in extension.backend.execute.call_args_list] == [
+        "movetoworkspace 3,address:0x1",
+        [
+            "togglefloating address:0x2",
+            "resizewindowpixel exact 800 600,class:term",
+            "centerwindow class:term",
+        ],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_launch_on_missing(extension):
+    launched = [client("0x1", "kitty-drop")]
+    extension.get_clients = AsyncMock(side_effect=[[], [], launched])
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await extension.run_hdrop("kitty")
+
+    # polls until the window shows up
+    assert sleep.await_count == 2
+
+    assert [c.args[0] for c in extension.backend.execute.call_args_list] == [
+        "exec kitty --class kitty-drop",
+        "movetoworkspacesilent special:hdrop,class:kitty-drop",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_launch_on_missing_timeout(extension):
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await extension.run_hdrop("kitty")
+
+    assert sleep.await_count == 40
+    extension.backend.execute.assert_called_once_with("exec kitty --class kitty-drop")
+
+
+@pytest.mark.asyncio
+async def test_reload_unchanged():
+    config = {"hdrop": {"apps": {"kitty": dict(APPS["kitty"])}}}
+    ext = make_extension(Extension)
+    await ext.load_config(config)
+    await ext.on_reload()
+
+    # same content merged in place: nothing is reloaded
+    merge(config, {"hdrop": {"apps": {"kitty": dict(APPS["kitty"])}}}, replace=True)
+    with patch.object(ext.config, "clear") as clear:
+        await ext.load_config(config)
+        await ext.on_reload()
+    clear.assert_not_called()
+
+    # changed content merged in place: the apps are reloaded
+    merge(config, {"hdrop": {"apps": {"kitty": dict(APPS["kitty"], focus=True)}}}, replace=True)
+    await ext.load_config(config)
+    await ext.on_reload()
+    assert ext.apps["kitty"]["focus"] is True
+
+
+@pytest.mark.asyncio
+async def test_focus(extension):
+    extension.get_clients.return_value = [client("0x1", "term"), client("0x2", "term", "special:hdrop")]
+    await extension.run_focus("term")
+    extension.backend.execute.assert_called_once_with("movetoworkspace 3,address:0x2")
+
+    extension.backend.execute.reset_mock()
+    extension.get_clients.return_value = [client("0x1", "term")]
+    await extension.run_focus("term")
+    extension.backend.execute.assert_called_once_with("focuswindow class:term")
+
+
+@pytest.mark.asyncio
+async def test_hide(extension):
+    await extension.run_hide("term")
+    extension.backend.execute.assert_not_called()
+
+    extension.get_clients.return_value = [client("0x1", "term")]
+    await extension.run_hide("term")
+    extension.backend.execute.assert_called_once_with("movetoworkspacesilent special:hdrop,class:term")
+
+
+@pytest.mark.asyncio
+async def test_reload_apps_changes():
+    # the manager merges the new configuration in place on reload
+    config = {"hdrop": {"apps": {"kitty": dict(APPS["kitty"])}}}
+    ext = make_extension(Extension)
+    await ext.load_config(config)
+    await ext.on_reload()
+    assert await ext.run_hdrop("term") == "Error: app 'term' not configured"
+
+    merge(config, {"hdrop": {"apps": {"kitty": dict(APPS["kitty"]), "term": dict(APPS["term"])}}}, replace=True)
+    await ext.load_config(config)
+    await ext.on_reload()
+    assert await ext.run_hdrop("term") is None
+
+    merge(config, {"hdrop": {"apps": {"term": dict(APPS["term"])}}}, replace=True)
+    await ext.load_config(config)
+    await ext.on_reload()
+    assert await ext.run_hdrop("kitty") == "Error: app 'kitty' not configured"
+    assert await ext.run_hdrop("term") is None